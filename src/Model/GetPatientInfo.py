@@ -112,7 +112,8 @@ class DicomTree(object):
         dataset = pydicom.dcmread(filename, force=True)
         return dataset
 
-    def data_element_to_dict(self, data_element):
+    @staticmethod
+    def data_element_to_dict(data_element):
         """
         Convert the data_element to an ordered dicitonary
 
@@ -135,7 +136,8 @@ class DicomTree(object):
                 # And store it as key: 'item: index num',
                 # value: dictionary of the item
                 # in the dictionary
-                items['item ' + str(tmp)] = self.dataset_to_dict(dataset_item)
+                items['item ' + str(tmp)] = \
+                    DicomTree.dataset_to_dict(dataset_item)
                 tmp += 1
         # If current data element is not pixel data element
         elif data_element.name != 'Pixel Data':
@@ -148,7 +150,8 @@ class DicomTree(object):
             ordered_dict[data_element.name] = temp_list
         return ordered_dict
 
-    def dataset_to_dict(self, dataset):
+    @staticmethod
+    def dataset_to_dict(dataset):
         """
         Convert the dataset to an ordered dictionary.
 
@@ -161,5 +164,5 @@ class DicomTree(object):
         for data_element in dataset:
             # Update the dictionary with the key/value pairs from dictionary.
             # The dictionary is converted from every data_element.
-            ordered_dict.update(self.data_element_to_dict(data_element))
+            ordered_dict.update(DicomTree.data_element_to_dict(data_element))
         return ordered_dict
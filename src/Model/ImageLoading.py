@@ -19,15 +19,37 @@ not the case, however this alternative function promotes scalability and
 durability of the process).
 """
 import collections
+import logging
 import math
+import os
 import re
-from multiprocessing import Queue, Process
+from concurrent.futures import ThreadPoolExecutor
 
+import matplotlib.path
 import numpy as np
-from dicompylercore import dvhcalc
+from dicompylercore import dvh, dvhcalc
 from pydicom import dcmread
+from pydicom.encaps import generate_pixel_data_frame
 from pydicom.errors import InvalidDicomError
 
+# nvImageCodec is optional. When it is installed, JPEG 2000 encoded dose
+# grids are decoded on the GPU instead of by pydicom.
+try:
+    from nvidia import nvimgcodec
+
+    FEATURE_TOGGLE_GPU_DECODE = True
+except ImportError:
+    FEATURE_TOGGLE_GPU_DECODE = False
+
+# Numba is optional. When it is installed, the DVH histograms are
+# accumulated by a compiled kernel instead of by NumPy.
+try:
+    from numba import njit
+
+    FEATURE_TOGGLE_NUMBA = True
+except ImportError:
+    FEATURE_TOGGLE_NUMBA = False
+
 allowed_classes = {
     # CT Image
     "1.2.840.10008.5.1.4.1.1.2": {
@@ -71,6 +93,19 @@ allowed_classes = {
     }
 }
 
+# Maximum number of threads used to read DICOM files concurrently.
+max_read_workers = min(8, os.cpu_count() or 1)
+
+# JPEG 2000 Image Compression (Lossless Only) and JPEG 2000 Image
+# Compression transfer syntaxes.
+jpeg_2000_transfer_syntaxes = ["1.2.840.10008.1.2.4.90",
+                               "1.2.840.10008.1.2.4.91"]
+
+# Implicit VR Little Endian and Explicit VR Little Endian transfer
+# syntaxes, whose pixel data is stored uncompressed.
+uncompressed_transfer_syntaxes = ["1.2.840.10008.1.2",
+                                  "1.2.840.10008.1.2.1"]
+
 
 class NotRTSetError(Exception):
     pass
@@ -80,6 +115,28 @@ class NotAllowedClassError(Exception):
     pass
 
 
+def read_dicom_file(file, file_type=None):
+    """
+    Reads a single file with PyDicom. Used by get_datasets(..) so that
+    files can be read concurrently by a pool of worker threads.
+    :param file: Path of the file to be read.
+    :param file_type: Optional modality. Datasets of an allowed class
+        but another modality are dropped here, so that they are not kept
+        in memory until every file has been read.
+    :return: PyDicom dataset object, or None if the file is not DICOM or
+        not of the given modality.
+    """
+    try:
+        read_file = dcmread(file)
+    except InvalidDicomError:
+        return None
+
+    if file_type is not None and read_file.SOPClassUID in allowed_classes \
+            and read_file.Modality != file_type:
+        return None
+    return read_file
+
+
 def get_datasets(filepath_list, file_type=None):
     """
     This function generates two dictionaries: the dictionary of PyDicom
@@ -91,43 +148,54 @@ def get_datasets(filepath_list, file_type=None):
     are filepaths pointing to the location of the .dcm file on the
     user's computer.
     :param filepath_list: List of all files to be searched.
+    :param file_type: Optional modality of the datasets to keep.
     :return: Tuple (read_data_dict, file_names_dict)
     """
     read_data_dict = {}
     file_names_dict = {}
 
-    slice_count = 0
-    sr_count = 0
-    for file in natural_sort(filepath_list):
-        try:
-            read_file = dcmread(file)
-        except InvalidDicomError:
-            pass
-        else:
-            if read_file.SOPClassUID in allowed_classes:
-                allowed_class = allowed_classes[read_file.SOPClassUID]
-                if allowed_class["sliceable"]:
-                    slice_name = slice_count
-                    slice_count += 1
-                else:
-                    # Read from Series Description to determine what is
-                    # stored in the SR file.
-                    if allowed_class["name"] == "sr":
-                        if read_file.SeriesDescription == "CLINICAL-DATA":
-                            slice_name = "sr-cd"
-                        elif read_file.SeriesDescription == "PYRADIOMICS":
-                            slice_name = "sr-rad"
-                        else:
-                            slice_name = "sr-other-" + str(sr_count)
-                            sr_count += 1
+    # Reading is I/O bound, so the files are read concurrently and then
+    # processed in their natural sort order. Each dataset is processed
+    # as soon as it is read, so that only the datasets that are kept
+    # stay in memory.
+    sorted_files = natural_sort(filepath_list)
+    with ThreadPoolExecutor(max_workers=max_read_workers) as executor:
+        futures = [executor.submit(read_dicom_file, file, file_type)
+                   for file in sorted_files]
+
+        slice_count = 0
+        sr_count = 0
+        for file, future in zip(sorted_files, futures):
+            read_file = future.result()
+            if read_file is not None:
+                if read_file.SOPClassUID in allowed_classes:
+                    allowed_class = allowed_classes[read_file.SOPClassUID]
+                    if allowed_class["sliceable"]:
+                        slice_name = slice_count
+                        slice_count += 1
                     else:
-                        slice_name = allowed_class["name"]
+                        # Read from Series Description to determine what is
+                        # stored in the SR file.
+                        if allowed_class["name"] == "sr":
+                            if read_file.SeriesDescription == "CLINICAL-DATA":
+                                slice_name = "sr-cd"
+                            elif read_file.SeriesDescription == "PYRADIOMICS":
+                                slice_name = "sr-rad"
+                            else:
+                                slice_name = "sr-other-" + str(sr_count)
+                                sr_count += 1
+                        else:
+                            slice_name = allowed_class["name"]
 
-                if file_type is None or read_file.Modality == file_type:
-                    read_data_dict[slice_name] = read_file
-                    file_names_dict[slice_name] = file
-            else:
-                raise NotAllowedClassError
+                    if file_type is None or read_file.Modality == file_type:
+                        read_data_dict[slice_name] = read_file
+                        file_names_dict[slice_name] = file
+                else:
+                    # Leaving the executor waits for every queued read,
+                    # so cancel the reads that have not started yet.
+                    for pending in futures:
+                        pending.cancel()
+                    raise NotAllowedClassError
 
     sorted_read_data_dict, sorted_file_names_dict = \
         image_stack_sort(read_data_dict, file_names_dict)
@@ -371,42 +439,403 @@ def calc_dvhs(dataset_rtss, dataset_rtdose, rois, dict_thickness,
     return dict_dvh
 
 
-def calc_dvh_worker(rtss, dose, roi, queue, thickness, dose_limit=None):
-    dvh = {}
-    dvh[roi] = \
-        dvhcalc.get_dvh(rtss, dose, roi, dose_limit, thickness=thickness)
-    queue.put(dvh)
+def decode_dose_pixel_array(dataset_rtdose):
+    """
+    Gets the pixel array of an RTDOSE. JPEG 2000 encoded dose grids are
+    decoded on the GPU with nvImageCodec when it is available, as
+    decoding them on the CPU is often the slowest part of preparing the
+    DVH calculation. Anything else, or a failed GPU decode, falls back
+    to pydicom.
+    :param dataset_rtdose: RTDOSE DICOM dataset object.
+    :return: Pixel array of the RTDOSE.
+    """
+    file_meta = getattr(dataset_rtdose, 'file_meta', None)
+    transfer_syntax = getattr(file_meta, 'TransferSyntaxUID', None)
+    if FEATURE_TOGGLE_GPU_DECODE \
+            and transfer_syntax in jpeg_2000_transfer_syntaxes:
+        try:
+            frame_count = int(getattr(dataset_rtdose, 'NumberOfFrames', 1))
+            frames = list(generate_pixel_data_frame(
+                dataset_rtdose.PixelData, frame_count))
+            decode_params = nvimgcodec.DecodeParams(
+                allow_any_depth=True,
+                color_spec=nvimgcodec.ColorSpec.UNCHANGED)
+            images = nvimgcodec.Decoder().decode(frames,
+                                                 params=decode_params)
+            shape = (dataset_rtdose.Rows, dataset_rtdose.Columns)
+            pixel_array = np.stack(
+                [np.asarray(image.cpu()).reshape(shape) for image in images])
+            return pixel_array if frame_count > 1 else pixel_array[0]
+        except Exception as e:
+            logging.warning("GPU decoding of the RT Dose failed, "
+                            "decoding with pydicom instead: %s", e)
+
+    return dataset_rtdose.pixel_array
+
+
+def get_dose_cube_view(dataset_rtdose):
+    """
+    Gets the stored pixel values of an uncompressed, little endian
+    RTDOSE as an array over the dataset's own pixel data, instead of
+    pydicom decoding the whole grid into a new array and keeping it on
+    the dataset.
+    :param dataset_rtdose: RTDOSE DICOM dataset object.
+    :return: Read-only (frames, rows, columns) array of the stored
+        pixel values, or None if the pixel data cannot be viewed as one.
+    """
+    file_meta = getattr(dataset_rtdose, 'file_meta', None)
+    transfer_syntax = getattr(file_meta, 'TransferSyntaxUID', None)
+    bits_allocated = dataset_rtdose.get('BitsAllocated')
+    if transfer_syntax not in uncompressed_transfer_syntaxes \
+            or bits_allocated not in (16, 32) \
+            or dataset_rtdose.get('PixelRepresentation', 0) != 0:
+        return None
+
+    dtype = np.dtype('<u2' if bits_allocated == 16 else '<u4')
+    frames = int(getattr(dataset_rtdose, 'NumberOfFrames', 1))
+    shape = (frames, dataset_rtdose.Rows, dataset_rtdose.Columns)
+    count = frames * dataset_rtdose.Rows * dataset_rtdose.Columns
+    if len(dataset_rtdose.PixelData) < count * dtype.itemsize:
+        return None
+
+    return np.frombuffer(dataset_rtdose.PixelData, dtype=dtype,
+                         count=count).reshape(shape)
+
+
+def get_dose_luts(dataset_rtdose):
+    """
+    Gets the patient coordinates of each column and row of a dose grid,
+    as dicompyler-core's DicomParser.GetPatientToPixelLUT() does. On
+    decubitus orientations the columns run along the y axis and the
+    rows along the x axis, rather than the other way around.
+    :param dataset_rtdose: RTDOSE DICOM dataset object.
+    :return: Tuple (col_lut, row_lut, x_along_rows) where col_lut and
+        row_lut are the coordinates of each column and row, and
+        x_along_rows is True if the rows run along the x axis.
+    """
+    row_spacing, col_spacing = map(float, dataset_rtdose.PixelSpacing)
+    orientation = np.array(
+        list(map(float, dataset_rtdose.ImageOrientationPatient)))
+    position = np.array(
+        list(map(float, dataset_rtdose.ImagePositionPatient)))
+
+    columns = dataset_rtdose.Columns
+    rows = dataset_rtdose.Rows
+
+    # Equation C.7.6.2.1-1, for the centre of the last voxel. The
+    # coordinates in between are spaced evenly, exactly as in
+    # dicompyler-core, so that voxel centres on a contour's edge fall
+    # on the same side of it in both.
+    matrix_m = np.array(
+        [[orientation[0] * col_spacing, orientation[3] * row_spacing, 0,
+          position[0]],
+         [orientation[1] * col_spacing, orientation[4] * row_spacing, 0,
+          position[1]],
+         [orientation[2] * col_spacing, orientation[5] * row_spacing, 0,
+          position[2]],
+         [0, 0, 0, 1]])
+    last = np.matmul(matrix_m, np.array([columns - 1, rows - 1, 0, 1]))
+
+    x_along_rows = abs(orientation[3]) > abs(orientation[0])
+    col_axis, row_axis = (1, 0) if x_along_rows else (0, 1)
+    col_lut = np.linspace(position[col_axis], last[col_axis], columns)
+    row_lut = np.linspace(position[row_axis], last[row_axis], rows)
+
+    return col_lut, row_lut, x_along_rows
 
 
-def multi_calc_dvh(dataset_rtss, dataset_rtdose, rois, dict_thickness,
-                   dose_limit=None):
+def get_dose_grid(dataset_rtdose):
     """
-    Multiprocessing variant of calc_dvh for fork-based platforms.
+    Reads the dose grid of an RTDOSE once so that it can be shared by
+    the DVH calculation of every ROI.
+    :param dataset_rtdose: RTDOSE DICOM dataset object.
+    :return: Tuple (pixel_array, dose_planes) where pixel_array is a
+        (frames, rows, columns) array of the stored pixel values and
+        dose_planes is the z coordinate of each frame.
     """
-    queue = Queue()
-    processes = []
-    dict_dvh = {}
+    pixel_array = get_dose_cube_view(dataset_rtdose)
+    if pixel_array is None:
+        pixel_array = decode_dose_pixel_array(dataset_rtdose)
+    if pixel_array.ndim == 2:
+        pixel_array = pixel_array[np.newaxis]
+
+    # The frames run against the z axis on feet first orientations.
+    orientation = np.array(
+        list(map(float, dataset_rtdose.ImageOrientationPatient)))
+    z_sign = np.sign(np.cross(orientation[0:3], orientation[3:6])[2])
+    position_z = float(dataset_rtdose.ImagePositionPatient[2])
+    if 'GridFrameOffsetVector' in dataset_rtdose:
+        offsets = np.array(
+            list(map(float, dataset_rtdose.GridFrameOffsetVector)))
+        dose_planes = position_z + z_sign * offsets
+    else:
+        dose_planes = np.array([position_z])
+
+    return pixel_array, dose_planes
+
+
+def get_dose_frame(dose_planes, z, threshold=0.5):
+    """
+    Gets the frame of the dose grid nearest to the given z coordinate.
+    :param dose_planes: z coordinate of each frame of the dose grid.
+    :param z: z coordinate of the plane in mm.
+    :param threshold: Maximum distance in mm to the nearest frame for it
+        to be used without interpolation.
+    :return: Index of the nearest frame, or None if no frame lies within
+        the threshold.
+    """
+    distances = np.fabs(dose_planes - z)
+    nearest = np.argmin(distances)
+    if distances[nearest] < threshold:
+        return nearest
+    return None
 
-    roi_list = []
-    for key in rois:
-        roi_list.append(key)
 
-    for i in range(len(roi_list)):
-        thickness = None
-        if roi_list[i] in dict_thickness:
-            thickness = dict_thickness[roi_list[i]]
-        p = Process(target=calc_dvh_worker,
-                    args=(dataset_rtss, dataset_rtdose, roi_list[i],
-                          queue, thickness, dose_limit,))
-        processes.append(p)
-        p.start()
+def get_dose_plane(dose_grid, dose_planes, z, threshold=0.5):
+    """
+    Gets the dose plane at the given z coordinate, interpolating between
+    the two nearest frames when no frame lies within the threshold.
+    :param dose_grid: Pixel array produced by get_dose_grid(..).
+    :param dose_planes: z coordinate of each frame of the dose grid.
+    :param z: z coordinate of the plane in mm.
+    :param threshold: Maximum distance in mm to the nearest frame for it
+        to be used without interpolation.
+    :return: 2D array of the dose grid's values (as floats if they were
+        interpolated), or None if the plane is outside of the dose grid.
+    """
+    nearest = get_dose_frame(dose_planes, z, threshold)
+    if nearest is not None:
+        return dose_grid[nearest]
+    if z < dose_planes.min() or z > dose_planes.max():
+        return None
 
-    for process in processes:
-        dvh = queue.get()
-        dict_dvh.update(dvh)
+    # Interpolate between the frames either side of z.
+    below = np.where(dose_planes <= z, dose_planes, -np.inf).argmax()
+    above = np.where(dose_planes >= z, dose_planes, np.inf).argmin()
+    fraction = (z - dose_planes[below]) \
+        / (dose_planes[above] - dose_planes[below])
+    return (1 - fraction) * dose_grid[below] + fraction * dose_grid[above]
+
+
+def get_structure_planes(dataset_rtss):
+    """
+    Groups the contours of every ROI by the plane they lie on.
+    :param dataset_rtss: RTSTRUCT DICOM dataset object.
+    :return: Dictionary where the keys are ROI numbers and the values
+        are dictionaries of z coordinates to lists of (N, 2) arrays of
+        the x and y coordinates of each contour on that plane.
+    """
+    dict_planes = {}
+    for roi in dataset_rtss.ROIContourSequence:
+        planes = collections.defaultdict(list)
+        if 'ContourSequence' in roi:
+            for roi_slice in roi.ContourSequence:
+                points = np.array(roi_slice.ContourData,
+                                  dtype=np.float64).reshape(-1, 3)
+                planes[round(points[0][2], 2)].append(points[:, 0:2])
+        dict_planes[roi.ReferencedROINumber] = planes
 
-    for process in processes:
-        process.join()
+    return dict_planes
+
+
+def get_plane_mask(contours, col_lut, row_lut, x_along_rows=False,
+                   out=None):
+    """
+    Rasterises the contours of an ROI on one plane onto the dose grid.
+    A voxel is inside a contour when its centre is, as in
+    dicompyler-core, so that both give the same DVHs. Contours are
+    combined with XOR so that inner contours become holes.
+    :param contours: List of (N, 2) arrays of contour x and y
+        coordinates.
+    :param col_lut: Coordinate of each column of the dose grid.
+    :param row_lut: Coordinate of each row of the dose grid.
+    :param x_along_rows: True if the rows of the dose grid run along
+        the x axis, as on decubitus orientations.
+    :param out: Optional boolean array of the dose grid's plane shape to
+        reuse for the mask instead of allocating a new one.
+    :return: 2D boolean array, True for voxels inside the ROI.
+    """
+    if out is None:
+        out = np.zeros((len(row_lut), len(col_lut)), dtype=bool)
+    else:
+        out.fill(False)
+
+    x_lut, y_lut = (row_lut, col_lut) if x_along_rows else (col_lut, row_lut)
+    for contour in contours:
+        # Only the voxels within the contour's bounding box can be
+        # inside it, so only their centres are tested.
+        x_range = np.flatnonzero((x_lut >= contour[:, 0].min())
+                                 & (x_lut <= contour[:, 0].max()))
+        y_range = np.flatnonzero((y_lut >= contour[:, 1].min())
+                                 & (y_lut <= contour[:, 1].max()))
+        if x_range.size == 0 or y_range.size == 0:
+            continue
+        x_range = slice(x_range[0], x_range[-1] + 1)
+        y_range = slice(y_range[0], y_range[-1] + 1)
+        rows, cols = (x_range, y_range) if x_along_rows \
+            else (y_range, x_range)
+        col_points, row_points = np.meshgrid(col_lut[cols], row_lut[rows])
+        x_points, y_points = (row_points, col_points) if x_along_rows \
+            else (col_points, row_points)
+        inside = matplotlib.path.Path(contour).contains_points(
+            np.column_stack((x_points.ravel(), y_points.ravel())))
+        out[rows, cols] ^= inside.reshape(col_points.shape)
+
+    return out
+
+
+def _dvh_accumulate(dose_bins, mask, hist, nbins):
+    """
+    Add the dose bins of the voxels inside a mask to a histogram in a
+    single pass, without building the masked array in between. Only
+    used once compiled by Numba.
+    :param dose_bins: Flattened dose plane of bin indices.
+    :param mask: Flattened boolean mask of the same size.
+    :param hist: Histogram to add to, of at least nbins bins.
+    :param nbins: Bins at or above this are left out.
+    :return: Number of voxels added to the histogram.
+    """
+    voxel_count = 0
+    for idx in range(mask.size):
+        if mask[idx]:
+            v = dose_bins[idx]
+            if v < nbins:
+                hist[v] += 1
+                voxel_count += 1
+    return voxel_count
+
+
+if FEATURE_TOGGLE_NUMBA:
+    try:
+        _dvh_accumulate = njit(cache=True, nogil=True)(_dvh_accumulate)
+    except RuntimeError:
+        # Frozen (PyInstaller) builds have no source file for Numba to
+        # cache the compiled kernel next to, so it is compiled on first
+        # use instead.
+        _dvh_accumulate = njit(nogil=True)(_dvh_accumulate)
+
+
+def calc_dvhs_vectorized(dataset_rtss, dataset_rtdose, rois,
+                         dict_thickness, interrupt_flag=None,
+                         dose_limit=None):
+    """
+    Vectorised variant of calc_dvhs. The dose grid is read and quantised
+    into 1 cGy bins once, each ROI is rasterised into a mask per plane,
+    and the masked bins are counted with a single histogram per ROI.
+    This avoids calling dicompyler-core per ROI, while giving the same
+    DVHs for head and feet first supine, prone and decubitus dose grids.
+    Every DVH calculation in OnkoDICOM goes through this function.
+    :param dataset_rtss: RTSTRUCT DICOM dataset object.
+    :param dataset_rtdose: RTDOSE DICOM dataset object.
+    :param rois: Dictionary of ROI information.
+    :param dict_thickness: Dictionary where the keys are ROI numbers and
+        the values are thicknesses of the ROI.
+    :param interrupt_flag: A threading.Event() object that tells the
+        function to stop calculation.
+    :param dose_limit: Limit of dose in cGy for DVH calculation.
+    :return: Dictionary of all the DVHs of all the ROIs of the patient.
+    """
+    pixel_array, dose_planes = get_dose_grid(dataset_rtdose)
+    col_lut, row_lut, x_along_rows = get_dose_luts(dataset_rtdose)
+    dict_planes = get_structure_planes(dataset_rtss)
+    voxel_area = abs(col_lut[1] - col_lut[0]) * abs(row_lut[1] - row_lut[0])
+
+    # Number of 1 cGy bins needed to hold the maximum dose.
+    dose_grid_scaling = float(dataset_rtdose.DoseGridScaling)
+    max_dose = int(float(pixel_array.max()) * dose_grid_scaling * 100) + 1
+
+    # Only the bin of each voxel is needed, so the grid is replaced by
+    # bin indices in the smallest unsigned type that holds them (uint16
+    # up to 655 Gy). This reduces the memory traffic of masking the grid
+    # for every ROI. Each frame is scaled in double precision and
+    # truncated, as dicompyler-core bins its doses.
+    bin_dtype = np.min_scalar_type(max_dose)
+    dose_bins_grid = np.empty(pixel_array.shape, dtype=bin_dtype)
+    for frame, frame_pixels in enumerate(pixel_array):
+        dose_bins_grid[frame] = frame_pixels * dose_grid_scaling * 100
+
+    if isinstance(dose_limit, int) and dose_limit < max_dose:
+        max_dose = dose_limit
+
+    # Every plane mask is rasterised into, and consumed from, the same
+    # scratch array rather than allocating a new mask per plane.
+    scratch_mask = np.zeros(dose_bins_grid.shape[1:], dtype=bool)
+
+    roi_list = list(rois)
+    hists = np.zeros((len(roi_list), max_dose), dtype=np.int64)
+    voxel_counts = np.zeros(len(roi_list), dtype=np.int64)
+
+    # Group the contours of every ROI by plane, so that each dose plane
+    # is fetched (or interpolated) once and all of the ROIs on it are
+    # histogrammed while it is still in cache, instead of passing over
+    # the dose grid once per ROI.
+    dict_plane_rois = collections.defaultdict(list)
+    for roi_index, roi in enumerate(roi_list):
+        for z, contours in dict_planes.get(roi, {}).items():
+            dict_plane_rois[z].append((roi_index, contours))
+
+    for z, plane_rois in dict_plane_rois.items():
+        frame = get_dose_frame(dose_planes, z)
+        if frame is not None:
+            dose_plane = dose_bins_grid[frame]
+        else:
+            # Planes between frames are interpolated from the stored
+            # values rather than from their bins, and then binned.
+            dose_plane = get_dose_plane(pixel_array, dose_planes, z)
+            if dose_plane is not None:
+                dose_plane = (dose_plane * dose_grid_scaling
+                              * 100).astype(bin_dtype)
+
+        for roi_index, contours in plane_rois:
+            mask = get_plane_mask(contours, col_lut, row_lut, x_along_rows,
+                                  out=scratch_mask)
+            if dose_plane is None:
+                # Still count the volume of planes outside the dose grid.
+                voxel_counts[roi_index] += np.count_nonzero(mask)
+                continue
+            if FEATURE_TOGGLE_NUMBA:
+                voxel_counts[roi_index] += _dvh_accumulate(
+                    dose_plane.ravel(), mask.ravel(), hists[roi_index],
+                    max_dose)
+                continue
+            dose_bins = dose_plane[mask]
+            dose_bins = dose_bins[dose_bins < max_dose]
+            voxel_counts[roi_index] += dose_bins.size
+            hists[roi_index] += np.bincount(dose_bins, minlength=max_dose)
+
+        if interrupt_flag is not None and interrupt_flag.is_set():
+            return
+
+    dict_dvh = {}
+    for roi_index, roi in enumerate(roi_list):
+        planes = dict_planes.get(roi, {})
+        hist = hists[roi_index]
+        voxel_count = voxel_counts[roi_index]
+
+        if roi in dict_thickness:
+            thickness = dict_thickness[roi]
+        elif len(planes) > 1:
+            thickness = np.min(np.diff(sorted(planes)))
+        else:
+            thickness = 0
+
+        name = rois[roi]['name']
+        if hist.max() > 0:
+            # Volume in cm^3, spread over the histogram.
+            volume = voxel_count * voxel_area * thickness / 1000
+            counts = np.trim_zeros(hist * volume / hist.sum(), trim='b')
+            dict_dvh[roi] = dvh.DVH(counts=counts,
+                                    bins=np.arange(0, counts.size + 1) / 100,
+                                    dvh_type='differential',
+                                    dose_units='Gy',
+                                    name=name).cumulative
+        else:
+            dict_dvh[roi] = dvh.DVH(counts=np.array([0]),
+                                    bins=np.arange(0, 2),
+                                    dvh_type='differential',
+                                    dose_units='Gy',
+                                    notes='Empty DVH',
+                                    name=name).cumulative
 
     return dict_dvh
 
@@ -513,17 +942,14 @@ def calculate_matrix(img_ds):
           position[2]],
          [0, 0, 0, 1]]
     )
-    x = []
-    y = []
-    for i in range(0, img_ds.Columns):
-        i_mat = matrix_m * np.matrix([[i], [0], [0], [1]])
-        x.append(float(i_mat[0]))
-
-    for j in range(0, img_ds.Rows):
-        j_mat = matrix_m * np.matrix([[0], [j], [0], [1]])
-        y.append(float(j_mat[1]))
-
-    return np.array(x), np.array(y)
+    # Only the first two columns and the translation of the matrix
+    # contribute to the x coordinate of each column (i, 0, 0, 1) and the
+    # y coordinate of each row (0, j, 0, 1), so transform every index at
+    # once rather than one matrix product per index.
+    x = matrix_m[0, 0] * np.arange(img_ds.Columns) + matrix_m[0, 3]
+    y = matrix_m[1, 1] * np.arange(img_ds.Rows) + matrix_m[1, 3]
+
+    return np.asarray(x, dtype=float), np.asarray(y, dtype=float)
 
 
 def get_pixluts(read_data_dict):
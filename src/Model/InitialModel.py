@@ -113,13 +113,9 @@ def create_initial_model():
         ImageLoading.get_raw_contour_data(dataset['rtss'])
     patient_dict_container.set("raw_contour", dict_raw_contour_data)
 
-    # dict_dicom_tree_rtss will be set in advance if the program
-    # generates a new rtss through the execution of
-    # ROI.create_initial_rtss_from_ct(...)
-    if patient_dict_container.get("dict_dicom_tree_rtss") is None:
-        dicom_tree_rtss = DicomTree(filepaths['rtss'])
-        patient_dict_container.set("dict_dicom_tree_rtss",
-                                   dicom_tree_rtss.dict)
+    # dict_dicom_tree_rtss is not built here. It is built from the
+    # dataset that has already been read, on first use, by
+    # PatientDictContainer.get_dict_dicom_tree_rtss()
 
     patient_dict_container.set(
         "list_roi_numbers",
@@ -117,8 +117,9 @@ def create_moving_model():
         moving_dict_container.set("file_rtss", filepaths['rtss'])
         moving_dict_container.set("dataset_rtss", dataset['rtss'])
 
-        dicom_tree_rtss = DicomTree(filepaths['rtss'])
-        moving_dict_container.set("dict_dicom_tree_rtss", dicom_tree_rtss.dict)
+        # dict_dicom_tree_rtss is not built here. It is built from the
+        # dataset that has already been read, on first use, by
+        # MovingDictContainer.get_dict_dicom_tree_rtss()
 
         moving_dict_container.set("list_roi_numbers", ordered_list_rois(
             moving_dict_container.get("rois")))
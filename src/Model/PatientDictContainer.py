@@ -12,6 +12,7 @@ Keyword arguments for DICOM-RT:
     num_points
     pixluts
 """
+from src.Model.GetPatientInfo import DicomTree
 from src.Model.Singleton import Singleton
 
 
@@ -99,6 +100,27 @@ class PatientDictContainer(metaclass=Singleton):
         """
         return self.additional_data.get(keyword)
 
+    def get_dict_dicom_tree_rtss(self):
+        """
+        Gets the DICOM tree dictionary of the RT Struct. It is only built
+        from the RT Struct dataset the first time it is needed, and is
+        then kept until it is replaced with set("dict_dicom_tree_rtss").
+        Example usage: patient_dict_container.get_dict_dicom_tree_rtss()
+        :return: Dictionary of the RT Struct, or None if there is no RT
+            Struct.
+        """
+        dict_tree = self.get("dict_dicom_tree_rtss")
+        if dict_tree is None and self.has_modality("rtss"):
+            # Once the RT Struct is modified, the modified dataset is
+            # kept under "dataset_rtss".
+            dataset_rtss = self.get("dataset_rtss")
+            if dataset_rtss is None:
+                dataset_rtss = self.dataset['rtss']
+            dict_tree = DicomTree.dataset_to_dict(dataset_rtss)
+            self.set("dict_dicom_tree_rtss", dict_tree)
+
+        return dict_tree
+
     def has_modality(self, dicom_type):
         """
         Example usage: dicom_data.has_modality("rtdose")
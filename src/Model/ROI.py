@@ -407,29 +407,14 @@ def calculate_matrix(img_ds):
         ),
     )
 
-    x = []
-    y = []
-    for i in range(0, img_ds.Columns):
-        i_mat = np.matmul(
-            matrix_m,
-            np.ndarray(
-                shape=(4, 1),
-                buffer=np.array([[i], [0], [0], [1]], dtype=float)
-            ),
-        )
-        x.append(float(i_mat[0]))
-
-    for j in range(0, img_ds.Rows):
-        j_mat = np.matmul(
-            matrix_m,
-            np.ndarray(
-                shape=(4, 1),
-                buffer=np.array([[0], [j], [0], [1]], dtype=float)
-            ),
-        )
-        y.append(float(j_mat[1]))
-
-    return np.array(x), np.array(y)
+    # Only the first two columns and the translation of the matrix
+    # contribute to the x coordinate of each column (i, 0, 0, 1) and the
+    # y coordinate of each row (0, j, 0, 1), so transform every index at
+    # once rather than one matrix product per index.
+    x = matrix_m[0, 0] * np.arange(img_ds.Columns) + matrix_m[0, 3]
+    y = matrix_m[1, 1] * np.arange(img_ds.Rows) + matrix_m[1, 3]
+
+    return np.asarray(x, dtype=float), np.asarray(y, dtype=float)
 
 
 def get_pixluts(dict_ds):
@@ -452,42 +437,48 @@ def get_pixluts(dict_ds):
     return dict_pixluts
 
 
-def calculate_pixels(pixlut, contour, prone=False, feetfirst=False):
+def _contour_to_pixels(pixlut, contour, prone, feetfirst):
     """
-    Calculate (Convert) contour points.
-    :param pixlut: transformation matrixx
+    Convert every point of a contour to pixel indices at once, by
+    comparing all of the contour's coordinates against the pixlut in a
+    single broadcast instead of searching the pixlut once per point.
+    :param pixlut: transformation matrix
     :param contour: raw contour data (3D)
     :param prone: label of prone
     :param feetfirst: label of feetfirst or head first
     :return: contour pixels
     """
-    pixels = []
-
+    points = np.asarray(contour, dtype=float).reshape(-1, 3)
     np_x = np.array(pixlut[0])
     np_y = np.array(pixlut[1])
-    if not feetfirst and not prone:
-        for i in range(0, len(contour), 3):
-            con_x = contour[i]
-            con_y = contour[i + 1]
-            x = np.argmax(np_x > con_x)
-            y = np.argmax(np_y > con_y)
-            pixels.append([x, y])
-    if feetfirst and not prone:
-        for i in range(0, len(contour), 3):
-            con_x = contour[i]
-            con_y = contour[i + 1]
-            x = np.argmin(np_x < con_x)
-            y = np.argmax(np_y > con_y)
-            pixels.append([x, y])
+    con_x = points[:, 0:1]
+    con_y = points[:, 1:2]
+
+    # Each row of the comparisons below is one contour point, and
+    # argmax/argmin along it finds the first matching pixlut entry.
     if prone:
-        for i in range(0, len(contour), 3):
-            con_x = contour[i]
-            con_y = contour[i + 1]
-            x = np.argmin(np_x < con_x)
-            y = np.argmin(np_y < con_y)
-            pixels.append([x, y])
+        x = np.argmin(np_x < con_x, axis=1)
+        y = np.argmin(np_y < con_y, axis=1)
+    elif feetfirst:
+        x = np.argmin(np_x < con_x, axis=1)
+        y = np.argmax(np_y > con_y, axis=1)
+    else:
+        x = np.argmax(np_x > con_x, axis=1)
+        y = np.argmax(np_y > con_y, axis=1)
 
-    return pixels
+    return np.stack((x, y), axis=1).tolist()
+
+
+def calculate_pixels(pixlut, contour, prone=False, feetfirst=False):
+    """
+    Calculate (Convert) contour points.
+    :param pixlut: transformation matrixx
+    :param contour: raw contour data (3D)
+    :param prone: label of prone
+    :param feetfirst: label of feetfirst or head first
+    :return: contour pixels
+    """
+    return _contour_to_pixels(pixlut, contour, prone, feetfirst)
 
 
 def calculate_pixels_sagittal(pixlut, contour, prone=False, feetfirst=False):
@@ -502,31 +493,7 @@ def calculate_pixels_sagittal(pixlut, contour, prone=False, feetfirst=False):
     ----------
     contour : object
     """
-    pixels = []
-    np_x = np.array(pixlut[0])
-    np_y = np.array(pixlut[1])
-    if not feetfirst and not prone:
-        for i in range(0, len(contour), 3):
-            con_x = contour[i]
-            con_y = contour[i + 1]
-            x = np.argmax(np_x > con_x)
-            y = np.argmax(np_y > con_y)
-            pixels.append([x, y])
-    if feetfirst and not prone:
-        for i in range(0, len(contour), 3):
-            con_x = contour[i]
-            con_y = contour[i + 1]
-            x = np.argmin(np_x < con_x)
-            y = np.argmax(np_y > con_y)
-            pixels.append([x, y])
-    if prone:
-        for i in range(0, len(contour), 3):
-            con_x = contour[i]
-            con_y = contour[i + 1]
-            x = np.argmin(np_x < con_x)
-            y = np.argmin(np_y < con_y)
-            pixels.append([x, y])
-    return pixels
+    return _contour_to_pixels(pixlut, contour, prone, feetfirst)
 
 
 def convert_hull_list_to_contours_data(rois_to_save, patient_dict_container):
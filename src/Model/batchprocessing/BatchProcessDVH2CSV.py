@@ -95,9 +95,9 @@ class BatchProcessDVH2CSV(BatchProcess):
                 dict_thickness = \
                     ImageLoading.get_thickness_dict(dataset_rtss,
                                                     read_data_dict)
-                raw_dvh = ImageLoading.calc_dvhs(dataset_rtss, dataset_rtdose,
-                                                 rois, dict_thickness,
-                                                 self.interrupt_flag)
+                raw_dvh = ImageLoading.calc_dvhs_vectorized(
+                    dataset_rtss, dataset_rtdose, rois, dict_thickness,
+                    self.interrupt_flag)
             except TypeError:
                 self.summary = "DVH_TYPE_ERROR"
                 return False
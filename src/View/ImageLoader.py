@@ -1,15 +1,13 @@
 import os
-import platform
+import threading
 from pathlib import Path
 
 from PySide6 import QtCore
-from pydicom import dcmread
 
 from src.Model import ImageLoading
 from src.Model.CalculateDVHs import dvh2rtdose, rtdose2dvh
 from src.Model.PatientDictContainer import PatientDictContainer
 from src.Model.ROI import create_initial_rtss_from_ct
-from src.Model.GetPatientInfo import DicomTree
 
 
 class ImageLoader(QtCore.QObject):
@@ -29,6 +27,8 @@ class ImageLoader(QtCore.QObject):
         self.existing_rtss = existing_rtss
         self.calc_dvh = False
         self.advised_calc_dvh = False
+        # Set once the user has advised whether to calculate DVHs.
+        self._advise_event = threading.Event()
 
     def load(self, interrupt_flag, progress_callback):
         """
@@ -41,7 +41,8 @@ class ImageLoader(QtCore.QObject):
         progress_callback.emit(("Creating datasets...", 0))
         try:
             # Gets the common root folder.
-            path = os.path.dirname(os.path.commonprefix(self.selected_files))
+            path = os.path.commonpath(
+                [os.path.dirname(file) for file in self.selected_files])
             read_data_dict, file_names_dict = ImageLoading.get_datasets(
                 self.selected_files)
         except ImageLoading.NotAllowedClassError:
@@ -71,7 +72,8 @@ class ImageLoader(QtCore.QObject):
             return False
 
         if 'rtss' in file_names_dict:
-            dataset_rtss = dcmread(file_names_dict['rtss'])
+            # The RT Struct has already been read by get_datasets(..).
+            dataset_rtss = read_data_dict['rtss']
 
             progress_callback.emit(("Getting ROI info...", 10))
             rois = ImageLoading.get_roi_info(dataset_rtss)
@@ -117,35 +119,16 @@ class ImageLoader(QtCore.QObject):
                     self.update_calc_dvh)
                 self.signal_request_calc_dvh.emit()
 
-                while not self.advised_calc_dvh:
-                    pass
+                self._advise_event.wait()
 
                 # Calculate DVHs
                 if self.calc_dvh:
-                    dataset_rtdose = dcmread(file_names_dict['rtdose'])
-
-                    # Spawn-based platforms (i.e Windows and MacOS) have
-                    # a large overhead when creating a new process, which
-                    # ends up making multiprocessing on these platforms more
-                    # expensive than linear calculation. As such,
-                    # multiprocessing is only available on Linux until a better
-                    # solution is found.
-                    fork_safe_platforms = ['Linux']
-                    if platform.system() in fork_safe_platforms:
-                        progress_callback.emit(("Calculating DVHs...", 60))
-                        raw_dvh = \
-                            ImageLoading.multi_calc_dvh(dataset_rtss,
-                                                        dataset_rtdose, rois,
-                                                        dict_thickness)
-                    else:
-                        progress_callback.emit(
-                            ("Calculating DVHs... (This may take a while)",
-                             60))
-                        raw_dvh = \
-                            ImageLoading.calc_dvhs(dataset_rtss,
-                                                   dataset_rtdose, rois,
-                                                   dict_thickness,
-                                                   interrupt_flag)
+                    dataset_rtdose = read_data_dict['rtdose']
+
+                    progress_callback.emit(("Calculating DVHs...", 60))
+                    raw_dvh = ImageLoading.calc_dvhs_vectorized(
+                        dataset_rtss, dataset_rtdose, rois, dict_thickness,
+                        interrupt_flag)
 
                     if interrupt_flag.is_set():  # Stop loading.
                         return False
@@ -208,10 +191,12 @@ class ImageLoader(QtCore.QObject):
         # Set some patient dict container attributes
         patient_dict_container.set("file_rtss", rtss_path)
         patient_dict_container.set("dataset_rtss", rtss)
-        ordered_dict = DicomTree(None).dataset_to_dict(rtss)
-        patient_dict_container.set("dict_dicom_tree_rtss", ordered_dict)
+        # The DICOM tree of the rtss is built when it is first needed,
+        # see PatientDictContainer.get_dict_dicom_tree_rtss()
+        patient_dict_container.set("dict_dicom_tree_rtss", None)
         patient_dict_container.set("selected_rois", [])
 
     def update_calc_dvh(self, advice):
         self.advised_calc_dvh = True
         self.calc_dvh = advice
+        self._advise_event.set()
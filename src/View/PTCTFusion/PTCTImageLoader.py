@@ -33,7 +33,8 @@ class PTCTImageLoader(ImageLoader):
         to the loaded DICOM files.
         """
         progress_callback.emit(("Getting File Path...", 0))
-        path = os.path.dirname(os.path.commonprefix(self.selected_files))
+        path = os.path.commonpath(
+            [os.path.dirname(file) for file in self.selected_files])
 
         # Populate the initial values in the PatientDictContainer singleton.
         progress_callback.emit(("Initialise Dictionary...", 5))
@@ -1,7 +1,22 @@
+import functools
 import platform
 from PySide6 import QtWidgets
 from src.Controller.PathHandler import resource_path
 
+# Only used to pick the stylesheet, so looked up once on import.
+_SYSTEM = platform.system()
+
+
+@functools.lru_cache(maxsize=2)
+def _load_stylesheet(stylesheet_path):
+    """
+    Read a stylesheet once per process rather than once per widget.
+    :param stylesheet_path: relative path of the stylesheet.
+    :return: contents of the stylesheet.
+    """
+    with open(resource_path(stylesheet_path)) as stylesheet:
+        return stylesheet.read()
+
 
 class CSV2ClinicalDataSROptions(QtWidgets.QWidget):
     """
@@ -18,20 +33,18 @@ class CSV2ClinicalDataSROptions(QtWidgets.QWidget):
         self.main_layout = QtWidgets.QVBoxLayout()
 
         # Get the stylesheet
-        if platform.system() == 'Darwin':
+        if _SYSTEM == 'Darwin':
             self.stylesheet_path = "res/stylesheet.qss"
         else:
             self.stylesheet_path = "res/stylesheet-win-linux.qss"
-        self.stylesheet = open(resource_path(self.stylesheet_path)).read()
+        self.stylesheet = _load_stylesheet(self.stylesheet_path)
 
         label = QtWidgets.QLabel("Please choose the file location:")
-        label.setStyleSheet(self.stylesheet)
 
         self.directory_layout = QtWidgets.QFormLayout()
 
         # Directory text box
         self.directory_input = QtWidgets.QLineEdit("No file selected")
-        self.directory_input.setStyleSheet(self.stylesheet)
         self.directory_input.setEnabled(False)
 
         # Change button
@@ -39,7 +52,6 @@ class CSV2ClinicalDataSROptions(QtWidgets.QWidget):
         self.change_button.setMaximumWidth(100)
         self.change_button.clicked.connect(self.show_file_browser)
         self.change_button.setObjectName("NormalButton")
-        self.change_button.setStyleSheet(self.stylesheet)
 
         self.directory_layout.addWidget(label)
         self.directory_layout.addRow(self.directory_input)
@@ -48,6 +60,9 @@ class CSV2ClinicalDataSROptions(QtWidgets.QWidget):
         self.main_layout.addLayout(self.directory_layout)
         self.setLayout(self.main_layout)
 
+        # Set once here, the child widgets inherit the stylesheet
+        self.setStyleSheet(self.stylesheet)
+
     def set_csv_input_location(self, path, enable=True,
                                change_if_modified=False):
         """
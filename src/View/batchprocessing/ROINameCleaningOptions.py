@@ -259,7 +259,10 @@ class ROINameCleaningOptions(QtWidgets.QWidget):
         #   value: a list of dataset paths containing this ROI
         rois = {}
         for rtss in rtstruct_list:
-            rtstruct = dcmread(rtss)
+            # Only the ROI names are needed, so the (potentially very
+            # large) ROI Contour Sequence is not read
+            rtstruct = dcmread(rtss,
+                               specific_tags=['StructureSetROISequence'])
             # Loop through each ROI in the RT Struct
             for i in range(len(rtstruct.StructureSetROISequence)):
                 # Get the ROI name
@@ -14,6 +14,10 @@ from src.Model.CalculateDVHs import dvh2csv, dvh2rtdose, rtdose2dvh
 from src.Model.PatientDictContainer import PatientDictContainer
 from src.Model.Worker import Worker
 
+# The platform cannot change while the program runs, so it is only
+# looked up once.
+_SYSTEM = platform.system()
+
 
 class DVHTab(QtWidgets.QWidget):
 
@@ -166,7 +170,7 @@ class DVHTab(QtWidgets.QWidget):
         """
         Prompt for DVH calculation.
         """
-        if platform.system() == "Linux":
+        if _SYSTEM == "Linux":
             choice = \
                 QtWidgets.QMessageBox.question(
                     self, "Calculate DVHs?",
@@ -189,7 +193,7 @@ class DVHTab(QtWidgets.QWidget):
             stylesheet_path = ""
 
             # Select appropriate style sheet
-            if platform.system() == 'Darwin':
+            if _SYSTEM == 'Darwin':
                 stylesheet_path = Path.cwd().joinpath('res', 'stylesheet.qss')
             else:
                 stylesheet_path = Path.cwd().joinpath('res', 'stylesheet-win-linux.qss')
@@ -340,11 +344,8 @@ class CalculateDVHProgressWindow(QtWidgets.QDialog):
         dict_thickness = ImageLoading.get_thickness_dict(dataset_rtss, self.patient_dict_container.dataset)
 
         interrupt_flag = threading.Event()
-        fork_safe_platforms = ['Linux']
-        if platform.system() in fork_safe_platforms:
-            worker = Worker(ImageLoading.multi_calc_dvh, dataset_rtss, dataset_rtdose, rois, dict_thickness)
-        else:
-            worker = Worker(ImageLoading.calc_dvhs, dataset_rtss, dataset_rtdose, rois, dict_thickness, interrupt_flag)
+        worker = Worker(ImageLoading.calc_dvhs_vectorized, dataset_rtss, dataset_rtdose, rois, dict_thickness,
+                        interrupt_flag)
 
         worker.signals.result.connect(self.dvh_calculated)
 
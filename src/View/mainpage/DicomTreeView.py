@@ -107,7 +107,8 @@ class DicomTreeView(QtWidgets.QWidget):
                 "dict_dicom_tree_rtdose")
 
         elif name == "rtss":
-            dict_tree = self.patient_dict_container.get("dict_dicom_tree_rtss")
+            dict_tree = \
+                self.patient_dict_container.get_dict_dicom_tree_rtss()
 
         elif name == "rtplan":
             dict_tree = self.patient_dict_container.get(
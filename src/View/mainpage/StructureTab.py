@@ -10,7 +10,6 @@ from src.Controller.ROIOptionsController import ROIDelOption, ROIDrawOption, \
 from src.Model.DICOM.Structure.DICOMSeries import Series
 from src.Model import ImageLoading
 from src.Model.CalculateDVHs import dvh2rtdose
-from src.Model.GetPatientInfo import DicomTree
 from src.Model.PatientDictContainer import PatientDictContainer
 from src.Model.MovingDictContainer import MovingDictContainer
 from src.Model.ROI import ordered_list_rois, get_roi_contour_pixel, \
@@ -104,20 +103,25 @@ class StructureTab(QtWidgets.QWidget):
         QColor object.
         """
         roi_color = dict()
-        roi_contour_info = dict_container.get(
-            "dict_dicom_tree_rtss")['ROI Contour Sequence']
-
-        if len(roi_contour_info) > 0:
-            for item, roi_dict in roi_contour_info.items():
-                # Note: the keys of roiContourInfo are "item 0", "item 1",
-                # etc. As all the ROI structures are identified by the ROI
-                # numbers in the whole code, we get the ROI number 'roi_id'
-                # by using the member 'list_roi_numbers'
-                id = item.split()[1]
+        # The colors are read from the RT Struct dataset itself, so that
+        # its DICOM tree is only built if the DICOM tree view is opened.
+        # Once the RT Struct is modified, the modified dataset is kept
+        # under "dataset_rtss".
+        dataset_rtss = dict_container.get("dataset_rtss")
+        if dataset_rtss is None:
+            dataset_rtss = dict_container.dataset['rtss']
+        roi_contour_sequence = dataset_rtss.get('ROIContourSequence', [])
+
+        if len(roi_contour_sequence) > 0:
+            for id, roi_contour in enumerate(roi_contour_sequence):
+                # Note: as all the ROI structures are identified by the
+                # ROI numbers in the whole code, we get the ROI number
+                # 'roi_id' of each item by using the member
+                # 'list_roi_numbers'
                 roi_id = dict_container.get(
-                    "list_roi_numbers")[int(id)]
-                if 'ROI Display Color' in roi_contour_info[item]:
-                    RGB_list = roi_contour_info[item]['ROI Display Color'][0]
+                    "list_roi_numbers")[id]
+                if 'ROIDisplayColor' in roi_contour:
+                    RGB_list = roi_contour.ROIDisplayColor
                     red = RGB_list[0]
                     green = RGB_list[1]
                     blue = RGB_list[2]
@@ -290,12 +294,9 @@ class StructureTab(QtWidgets.QWidget):
         self.moving_dict_container.set("dict_polygons_coronal", {})
 
         if "draw" in change_description or "transfer" in change_description:
-            dicom_tree_rtss = DicomTree(None)
-            dicom_tree_rtss.dataset = new_dataset
-            dicom_tree_rtss.dict = dicom_tree_rtss.dataset_to_dict(
-                dicom_tree_rtss.dataset)
-            self.moving_dict_container.set(
-                "dict_dicom_tree_rtss", dicom_tree_rtss.dict)
+            # The DICOM tree is rebuilt from the new RT Struct when it
+            # is next needed.
+            self.moving_dict_container.set("dict_dicom_tree_rtss", None)
             self.color_dict = self.init_color_roi(self.moving_dict_container)
             self.moving_dict_container.set("roi_color_dict", self.color_dict)
             if self.moving_dict_container.has_attribute("raw_dvh"):
@@ -385,12 +386,9 @@ class StructureTab(QtWidgets.QWidget):
         self.patient_dict_container.set("dict_polygons_coronal", {})
 
         if "draw" in change_description or "transfer" in change_description:
-            dicom_tree_rtss = DicomTree(None)
-            dicom_tree_rtss.dataset = new_dataset
-            dicom_tree_rtss.dict = dicom_tree_rtss.dataset_to_dict(
-                dicom_tree_rtss.dataset)
-            self.patient_dict_container.set(
-                "dict_dicom_tree_rtss", dicom_tree_rtss.dict)
+            # The DICOM tree is rebuilt from the new RT Struct when it
+            # is next needed.
+            self.patient_dict_container.set("dict_dicom_tree_rtss", None)
             self.color_dict = self.init_color_roi(self.patient_dict_container)
             self.patient_dict_container.set("roi_color_dict", self.color_dict)
             if self.patient_dict_container.has_attribute("raw_dvh"):
@@ -63,7 +63,9 @@ class SelectRTSSPopUp(QDialog):
         for i in range(len(existing_rtss)):
             checkbox = QCheckBox()
             checkbox.rtss = existing_rtss[i]
-            rtss = dcmread(checkbox.rtss.get_files()[0])
+            # Only the number of ROIs is shown, so skip the contour data
+            rtss = dcmread(checkbox.rtss.get_files()[0],
+                           specific_tags=['StructureSetROISequence'])
             checkbox.setFocusPolicy(QtCore.Qt.NoFocus)
             checkbox.setText("Series: %s (%s, %s %s)" % (
                 checkbox.rtss.series_description,
@@ -0,0 +1,403 @@
+import os
+import threading
+import numpy as np
+import pytest
+
+from pathlib import Path
+from pydicom import dcmread
+from pydicom.data import get_testdata_file
+from pydicom.dataset import Dataset, FileMetaDataset
+from pydicom.encaps import encapsulate
+from pydicom.errors import InvalidDicomError
+from pydicom.sequence import Sequence
+from src.Model import ImageLoading
+
+
+def find_DICOM_files(file_path):
+    """
+    Function to find DICOM files in a given folder.
+    :param file_path: File path of folder to search.
+    :return: List of file paths of DICOM files in given folder.
+    """
+
+    dicom_files = []
+
+    # Walk through directory
+    for root, dirs, files in os.walk(file_path, topdown=True):
+        for name in files:
+            # Attempt to open file as a DICOM file
+            try:
+                dcmread(os.path.join(root, name))
+            except (InvalidDicomError, FileNotFoundError):
+                pass
+            else:
+                dicom_files.append(os.path.join(root, name))
+    return dicom_files
+
+
+class TestImageLoading:
+    """
+    This class is to set up data and variables needed for the
+    ImageLoading functionality.
+    """
+
+    __test__ = False
+
+    def __init__(self):
+        # Load test DICOM files
+        desired_path = Path.cwd().joinpath('test', 'testdata')
+        selected_files = find_DICOM_files(desired_path)
+        self.read_data_dict, self.file_names_dict = \
+            ImageLoading.get_datasets(selected_files)
+
+        self.dataset_rtss = self.read_data_dict['rtss']
+        self.dataset_rtdose = self.read_data_dict['rtdose']
+        self.rois = ImageLoading.get_roi_info(self.dataset_rtss)
+        self.dict_thickness = ImageLoading.get_thickness_dict(
+            self.dataset_rtss, self.read_data_dict)
+
+
+@pytest.fixture(scope="module")
+def test_object():
+    """
+    Function to pass a shared TestImageLoading object to each test.
+    """
+    test = TestImageLoading()
+    return test
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_calc_dvhs_vectorized(test_object, monkeypatch, use_numba):
+    """
+    Test that the vectorised DVH calculation agrees with the DVHs
+    calculated by dicompyler-core, both when the histograms are
+    accumulated by NumPy and by the Numba kernel.
+    :param test_object: test_object function, for accessing the shared
+                        TestImageLoading object.
+    :param monkeypatch: pytest fixture, for switching the Numba kernel
+                        on and off.
+    :param use_numba: Whether the Numba kernel is used.
+    """
+    if use_numba and not ImageLoading.FEATURE_TOGGLE_NUMBA:
+        pytest.skip("Numba is not installed")
+    monkeypatch.setattr(ImageLoading, "FEATURE_TOGGLE_NUMBA", use_numba)
+
+    expected = ImageLoading.calc_dvhs(test_object.dataset_rtss,
+                                      test_object.dataset_rtdose,
+                                      test_object.rois,
+                                      test_object.dict_thickness,
+                                      threading.Event())
+    result = ImageLoading.calc_dvhs_vectorized(test_object.dataset_rtss,
+                                               test_object.dataset_rtdose,
+                                               test_object.rois,
+                                               test_object.dict_thickness)
+
+    assert result.keys() == expected.keys()
+    for roi in expected:
+        # Both rasterise and bin the same way, so only floating point
+        # differences in interpolated planes are allowed for.
+        assert result[roi].volume == \
+            pytest.approx(expected[roi].volume, rel=1e-3, abs=1e-3)
+        if expected[roi].volume == 0:
+            continue
+        assert result[roi].max == pytest.approx(expected[roi].max, abs=0.01)
+        assert result[roi].mean == \
+            pytest.approx(expected[roi].mean, abs=0.01)
+        for statistic in ["D2", "D50", "D98"]:
+            assert result[roi].statistic(statistic).value == \
+                pytest.approx(expected[roi].statistic(statistic).value,
+                              abs=0.01)
+
+
+def create_rtss_dataset(dict_roi_contours):
+    """
+    Creates an RTSTRUCT dataset holding the given contours.
+    :param dict_roi_contours: Dictionary where the keys are ROI numbers
+        and the values are lists of (N, 3) arrays of contour points.
+    :return: RTSTRUCT DICOM dataset object.
+    """
+    dataset = Dataset()
+    dataset.file_meta = FileMetaDataset()
+    dataset.file_meta.TransferSyntaxUID = "1.2.840.10008.1.2.1"
+    dataset.file_meta.MediaStorageSOPClassUID = \
+        "1.2.840.10008.5.1.4.1.1.481.3"
+    dataset.file_meta.MediaStorageSOPInstanceUID = "1.2.3.4"
+    dataset.is_little_endian = True
+    dataset.is_implicit_VR = False
+    dataset.SOPClassUID = "1.2.840.10008.5.1.4.1.1.481.3"
+    dataset.Modality = "RTSTRUCT"
+    dataset.StructureSetROISequence = Sequence()
+    dataset.ROIContourSequence = Sequence()
+    for roi_number, contours in dict_roi_contours.items():
+        structure_set_roi = Dataset()
+        structure_set_roi.ROINumber = roi_number
+        structure_set_roi.ROIName = "ROI " + str(roi_number)
+        structure_set_roi.ReferencedFrameOfReferenceUID = "1.2.3"
+        structure_set_roi.ROIGenerationAlgorithm = "MANUAL"
+        dataset.StructureSetROISequence.append(structure_set_roi)
+
+        roi_contour = Dataset()
+        roi_contour.ReferencedROINumber = roi_number
+        roi_contour.ContourSequence = Sequence()
+        for points in contours:
+            contour = Dataset()
+            contour.ContourGeometricType = "CLOSED_PLANAR"
+            contour.NumberOfContourPoints = len(points)
+            contour.ContourData = points.ravel().tolist()
+            roi_contour.ContourSequence.append(contour)
+        dataset.ROIContourSequence.append(roi_contour)
+    return dataset
+
+
+@pytest.mark.parametrize("orientation", [
+    [1, 0, 0, 0, 1, 0],  # Head First Supine
+    [-1, 0, 0, 0, -1, 0],  # Head First Prone
+    [0, -1, 0, 1, 0, 0],  # Head First Decubitus Left
+    [0, 1, 0, -1, 0, 0],  # Head First Decubitus Right
+])
+def test_calc_dvhs_vectorized_orientation(orientation):
+    """
+    Test that the vectorised DVH calculation agrees with the DVHs
+    calculated by dicompyler-core for supine, prone and decubitus dose
+    grids, whose rows run along the y or the x axis.
+    :param orientation: Image Orientation (Patient) of the dose grid.
+    """
+    dataset_rtdose = dcmread(get_testdata_file("rtdose.dcm"))
+    dataset_rtdose.ImageOrientationPatient = orientation
+
+    # Corners of the dose grid in patient coordinates.
+    position = np.array(dataset_rtdose.ImagePositionPatient, dtype=float)
+    spacing = np.array(dataset_rtdose.PixelSpacing, dtype=float)
+    along_row = np.array(orientation[0:3]) * spacing[1] \
+        * (dataset_rtdose.Columns - 1)
+    along_column = np.array(orientation[3:6]) * spacing[0] \
+        * (dataset_rtdose.Rows - 1)
+    corners = position + np.array([[0, 0, 0], along_row, along_column,
+                                   along_row + along_column])
+    x_min, y_min = corners.min(axis=0)[0:2]
+    x_max, y_max = corners.max(axis=0)[0:2]
+    x_mid, y_mid = (x_min + x_max) / 2, (y_min + y_max) / 2
+
+    # A rectangle, a triangle and a ring, on planes that lie both on
+    # and between the dose grid's frames.
+    dict_roi_contours = {1: [], 2: [], 3: []}
+    angles = np.linspace(0, 2 * np.pi, 32, endpoint=False)
+    for z in np.arange(position[2] + 5, position[2] + 60, 2.5):
+        dict_roi_contours[1].append(np.array(
+            [[x_min + 12, y_min + 17, z], [x_max - 23, y_min + 17, z],
+             [x_max - 23, y_max - 8, z], [x_min + 12, y_max - 8, z]]))
+        dict_roi_contours[2].append(np.array(
+            [[x_min + 5, y_min + 5, z], [x_max - 5, y_mid, z],
+             [x_mid, y_max - 5, z]]))
+        for radius in [35, 15]:
+            dict_roi_contours[3].append(np.column_stack((
+                x_mid + radius * np.cos(angles),
+                y_mid + radius * np.sin(angles),
+                np.full(angles.size, z))))
+    dataset_rtss = create_rtss_dataset(dict_roi_contours)
+    rois = ImageLoading.get_roi_info(dataset_rtss)
+
+    expected = ImageLoading.calc_dvhs(dataset_rtss, dataset_rtdose, rois,
+                                      {}, threading.Event())
+    result = ImageLoading.calc_dvhs_vectorized(dataset_rtss, dataset_rtdose,
+                                               rois, {})
+
+    assert result.keys() == expected.keys()
+    for roi in expected:
+        assert expected[roi].volume > 0
+        assert result[roi].volume == pytest.approx(expected[roi].volume)
+        assert result[roi].counts.tolist() == \
+            pytest.approx(expected[roi].counts.tolist())
+
+
+class FakeDecodedImage:
+    """
+    Stands in for an image decoded by nvImageCodec, which is returned
+    to the CPU as a flat buffer.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def cpu(self):
+        return np.frombuffer(self.frame, dtype=np.uint16)
+
+
+class FakeNvImgCodec:
+    """
+    Stands in for the nvImageCodec module. The "encoded" frames are the
+    raw pixel values, so that decoding them needs no GPU.
+    """
+
+    class ColorSpec:
+        UNCHANGED = "unchanged"
+
+    class DecodeParams:
+        def __init__(self, allow_any_depth, color_spec):
+            self.allow_any_depth = allow_any_depth
+            self.color_spec = color_spec
+
+    class Decoder:
+        fail = False
+        calls = 0
+
+        def decode(self, frames, params=None):
+            FakeNvImgCodec.Decoder.calls += 1
+            if FakeNvImgCodec.Decoder.fail:
+                raise RuntimeError("No CUDA device")
+            return [FakeDecodedImage(frame) for frame in frames]
+
+
+def create_dose_dataset(pixel_array, transfer_syntax):
+    """
+    Creates an RTDOSE dataset holding the given pixel array.
+    :param pixel_array: (frames, rows, columns) array of uint16 values.
+    :param transfer_syntax: Transfer syntax UID of the dataset. The
+        frames are encapsulated for JPEG 2000 transfer syntaxes.
+    :return: RTDOSE DICOM dataset object.
+    """
+    dataset = Dataset()
+    dataset.file_meta = FileMetaDataset()
+    dataset.file_meta.TransferSyntaxUID = transfer_syntax
+    dataset.is_little_endian = True
+    dataset.is_implicit_VR = False
+    dataset.NumberOfFrames = pixel_array.shape[0]
+    dataset.Rows = pixel_array.shape[1]
+    dataset.Columns = pixel_array.shape[2]
+    dataset.SamplesPerPixel = 1
+    dataset.PhotometricInterpretation = "MONOCHROME2"
+    dataset.BitsAllocated = 16
+    dataset.BitsStored = 16
+    dataset.HighBit = 15
+    dataset.PixelRepresentation = 0
+    if transfer_syntax in ImageLoading.jpeg_2000_transfer_syntaxes:
+        dataset.PixelData = encapsulate(
+            [frame.tobytes() for frame in pixel_array])
+    else:
+        dataset.PixelData = pixel_array.tobytes()
+    return dataset
+
+
+@pytest.fixture
+def fake_nvimgcodec(monkeypatch):
+    """
+    Function to make decode_dose_pixel_array(..) decode with a fake
+    nvImageCodec.
+    """
+    FakeNvImgCodec.Decoder.fail = False
+    FakeNvImgCodec.Decoder.calls = 0
+    monkeypatch.setattr(ImageLoading, "FEATURE_TOGGLE_GPU_DECODE", True)
+    monkeypatch.setattr(ImageLoading, "nvimgcodec", FakeNvImgCodec,
+                        raising=False)
+    return FakeNvImgCodec
+
+
+@pytest.mark.parametrize("frames", [1, 3])
+def test_decode_dose_pixel_array_gpu(fake_nvimgcodec, frames):
+    """
+    Test that JPEG 2000 dose grids are decoded by nvImageCodec, and
+    that the decoded frames are reshaped and stacked.
+    :param fake_nvimgcodec: fake_nvimgcodec function, for decoding with
+                            a fake nvImageCodec.
+    :param frames: Number of frames in the dose grid.
+    """
+    pixel_array = np.arange(frames * 3 * 4, dtype=np.uint16)
+    pixel_array = pixel_array.reshape(frames, 3, 4)
+    dataset = create_dose_dataset(pixel_array,
+                                  ImageLoading.jpeg_2000_transfer_syntaxes[0])
+
+    result = ImageLoading.decode_dose_pixel_array(dataset)
+
+    assert fake_nvimgcodec.Decoder.calls == 1
+    expected = pixel_array if frames > 1 else pixel_array[0]
+    assert result.shape == expected.shape
+    assert np.array_equal(result, expected)
+
+
+def test_decode_dose_pixel_array_not_jpeg_2000(fake_nvimgcodec):
+    """
+    Test that dose grids that are not JPEG 2000 encoded are decoded by
+    pydicom.
+    :param fake_nvimgcodec: fake_nvimgcodec function, for decoding with
+                            a fake nvImageCodec.
+    """
+    pixel_array = np.arange(2 * 3 * 4, dtype=np.uint16).reshape(2, 3, 4)
+    dataset = create_dose_dataset(pixel_array, "1.2.840.10008.1.2.1")
+
+    result = ImageLoading.decode_dose_pixel_array(dataset)
+
+    assert fake_nvimgcodec.Decoder.calls == 0
+    assert np.array_equal(result, pixel_array)
+
+
+def test_decode_dose_pixel_array_gpu_failure(fake_nvimgcodec, monkeypatch):
+    """
+    Test that the dose grid is decoded by pydicom when decoding it with
+    nvImageCodec fails.
+    :param fake_nvimgcodec: fake_nvimgcodec function, for decoding with
+                            a fake nvImageCodec.
+    :param monkeypatch: pytest fixture, for standing in for pydicom's
+                        decoding.
+    """
+    fake_nvimgcodec.Decoder.fail = True
+    pixel_array = np.arange(2 * 3 * 4, dtype=np.uint16).reshape(2, 3, 4)
+    dataset = create_dose_dataset(pixel_array,
+                                  ImageLoading.jpeg_2000_transfer_syntaxes[0])
+    # pydicom may not have a JPEG 2000 decoder installed, so its result
+    # is stood in for.
+    monkeypatch.setattr(Dataset, "pixel_array",
+                        property(lambda self: pixel_array))
+
+    result = ImageLoading.decode_dose_pixel_array(dataset)
+
+    assert fake_nvimgcodec.Decoder.calls == 1
+    assert np.array_equal(result, pixel_array)
+
+
+def test_get_dose_cube_view():
+    """
+    Test that the pixel data of an uncompressed dose grid is viewed in
+    place rather than copied, and that other dose grids are not viewed.
+    """
+    pixel_array = np.arange(2 * 3 * 4, dtype=np.uint16).reshape(2, 3, 4)
+    dataset = create_dose_dataset(pixel_array, "1.2.840.10008.1.2.1")
+
+    result = ImageLoading.get_dose_cube_view(dataset)
+
+    assert np.array_equal(result, pixel_array)
+    assert not result.flags.owndata
+    assert not result.flags.writeable
+
+    dataset = create_dose_dataset(pixel_array,
+                                  ImageLoading.jpeg_2000_transfer_syntaxes[0])
+    assert ImageLoading.get_dose_cube_view(dataset) is None
+
+
+def test_get_datasets_not_allowed_class(tmp_path, monkeypatch):
+    """
+    Test that reading stops at the first file with a SOP class that is
+    not allowed, rather than reading the files queued after it.
+    """
+    dataset = dcmread(get_testdata_file("CT_small.dcm"))
+    dataset.SOPClassUID = "1.2.3.4"
+    dataset.save_as(str(tmp_path / "0.dcm"))
+    dataset = dcmread(get_testdata_file("CT_small.dcm"))
+    filepaths = [str(tmp_path / "0.dcm")]
+    for i in range(1, 50):
+        filepaths.append(str(tmp_path / ("%d.dcm" % i)))
+        dataset.save_as(filepaths[-1])
+
+    read_files = []
+    read_dicom_file = ImageLoading.read_dicom_file
+
+    def counting_read_dicom_file(file, file_type=None):
+        read_files.append(file)
+        return read_dicom_file(file, file_type)
+
+    monkeypatch.setattr(ImageLoading, "max_read_workers", 1)
+    monkeypatch.setattr(ImageLoading, "read_dicom_file",
+                        counting_read_dicom_file)
+
+    with pytest.raises(ImageLoading.NotAllowedClassError):
+        ImageLoading.get_datasets(filepaths)
+    assert len(read_files) < len(filepaths)
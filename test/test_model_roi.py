@@ -13,8 +13,8 @@ from pydicom.tag import Tag
 
 from src.Model import ImageLoading
 from src.Model.PatientDictContainer import PatientDictContainer
-from src.Model.ROI import add_to_roi, calculate_matrix, create_roi, roi_to_geometry, \
-    get_roi_contour_pixel, manipulate_rois, geometry_to_roi, create_initial_rtss_from_ct
+from src.Model.ROI import add_to_roi, calculate_matrix, calculate_pixels, \
+    create_roi, roi_to_geometry, get_roi_contour_pixel, manipulate_rois, geometry_to_roi, create_initial_rtss_from_ct
 
 
 def find_DICOM_files(file_path):
@@ -102,6 +102,15 @@ def test_calculate_matrix():
     assert np.all(array_y == np.array([0, 1, 2, 3]))
 
 
+def test_calculate_pixels():
+    pixlut = (np.array([0, 1, 2, 3]), np.array([0, 1, 2, 3]))
+    contour = [0.5, 2.5, 0, 1.5, 0.5, 0, 2.5, 1.5, 0]
+    assert calculate_pixels(pixlut, contour) == [[1, 3], [2, 1], [3, 2]]
+    assert calculate_pixels(pixlut, contour, prone=True) == \
+        [[1, 3], [2, 1], [3, 2]]
+    assert calculate_pixels(pixlut, []) == []
+
+
 def test_add_to_roi():
     rt_ss = dataset.Dataset()
 
@@ -72,7 +72,7 @@ class TestDVHTab:
         self.main_window = MainWindow()
         self.dvh_tab = self.main_window.dvh_tab
         self.new_polygons = {}
-        self.raw_dvh = ImageLoading.multi_calc_dvh(dataset_rtss, dataset_rtdose, self.rois, dict_thickness)
+        self.raw_dvh = ImageLoading.calc_dvhs_vectorized(dataset_rtss, dataset_rtdose, self.rois, dict_thickness)
         self.dvh_x_y = ImageLoading.converge_to_0_dvh(self.raw_dvh)
 
 